@@ -0,0 +1,5 @@
+from .deps import get_dialog_manager
+
+__all__ = [
+    "get_dialog_manager",
+]
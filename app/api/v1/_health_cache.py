@@ -0,0 +1,42 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple, TypeVar, cast
+
+T = TypeVar("T")
+
+# Кэш результатов проверок: ключ -> (значение, момент истечения)
+_cache: Dict[str, Tuple[Any, float]] = {}
+_lock = asyncio.Lock()
+
+
+async def cached(ttl: float, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+    """
+    Получение результата проверки с кэшированием на заданное время.
+
+    Возвращает сохраненное значение, пока не истек TTL, иначе вызывает
+    проверку повторно. Обновление выполняется под блокировкой, чтобы
+    одновременные запросы не запускали одну и ту же проверку параллельно.
+
+    Args:
+    ----
+        ttl (float): Время жизни значения в секундах.
+        key (str): Ключ проверки в кэше.
+        fn: Асинхронная функция, выполняющая проверку.
+
+    Returns:
+    -------
+        Результат проверки из кэша или свежий результат.
+
+    """
+    entry = _cache.get(key)
+    if entry is not None and entry[1] > time.monotonic():
+        return cast(T, entry[0])
+
+    async with _lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            return cast(T, entry[0])
+
+        value = await fn()
+        _cache[key] = (value, time.monotonic() + ttl)
+        return value
@@ -0,0 +1,25 @@
+from typing import cast
+
+from fastapi import Request
+
+from app.services import DialogManager
+
+
+def get_dialog_manager(request: Request) -> DialogManager:
+    """
+    Dependency для получения менеджера диалогов.
+
+    Возвращает единственный экземпляр DialogManager, созданный при запуске
+    приложения в lifespan и сохраненный в состоянии приложения.
+
+    Args:
+    ----
+        request (Request): Текущий HTTP запрос.
+
+    Returns:
+    -------
+    DialogManager
+        Общий для процесса экземпляр менеджера диалогов.
+
+    """
+    return cast(DialogManager, request.app.state.dialog_manager)
@@ -1,5 +1,5 @@
 import time
-from datetime import datetime
+from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends
 
@@ -7,29 +7,36 @@ from app.core.config import settings
 from app.core.models import HealthResponse
 from app.services import DialogManager
 
-router = APIRouter()
+from ._health_cache import cached
+from .deps import get_dialog_manager
 
-# Время запуска приложения
-start_time = time.time()
+router = APIRouter(tags=["health"])
 
+# Время запуска приложения по монотонным часам
+start_monotonic = time.monotonic()
 
-def get_dialog_manager() -> DialogManager:
-    """
-    Dependency для получения менеджера диалогов в health endpoints.
+# Время жизни результатов проверок агентов и хранилища
+PROBE_TTL_SECONDS = 5.0
 
-    Создает и возвращает экземпляр DialogManager для проверки
-    доступности системы и агентов.
 
-    Returns
-    -------
-    DialogManager
-        Инициализированный экземпляр менеджера диалогов.
+async def _check_agents(dialog_manager: DialogManager) -> bool:
+    """Проверка наличия инициализированных агентов."""
+    try:
+        agents_info = dialog_manager.orchestrator.get_agent_info()
+        return len(agents_info["agents"]) > 0
+    except Exception:
+        return False
 
-    """
-    return DialogManager()
+
+async def _check_storage() -> bool:
+    """Проверка существования директории хранилища диалогов."""
+    try:
+        return settings.dialog_storage_path.exists()
+    except Exception:
+        return False
 
 
-@router.get("/health", response_model=HealthResponse)
+@router.get("/health", response_model=HealthResponse, operation_id="health_check")
 async def health_check(
     dialog_manager: DialogManager = Depends(get_dialog_manager),
 ) -> HealthResponse:
@@ -38,7 +45,8 @@ async def health_check(
 
     Выполняет комплексную проверку всех компонентов системы:
     доступности агентов, хранилища данных и общего состояния.
-    Возвращает детальную информацию для мониторинга.
+    Результаты проверок кэшируются на несколько секунд, чтобы частые
+    запросы балансировщика не повторяли их каждый раз.
 
     Args:
     ----
@@ -51,20 +59,13 @@ async def health_check(
 
     """
     current_time = time.time()
-    uptime_seconds = current_time - start_time
-
-    # Проверяем доступность агентов
-    try:
-        agents_info = await dialog_manager.orchestrator.get_agent_capabilities()
-        agents_available = len(agents_info) > 0
-    except Exception:
-        agents_available = False
+    uptime_seconds = time.monotonic() - start_monotonic
 
-    # Проверяем доступность хранилища
-    try:
-        storage_available = settings.dialog_storage_path.exists()
-    except Exception:
-        storage_available = False
+    # Проверяем доступность агентов и хранилища (результаты кэшируются)
+    agents_available = await cached(
+        PROBE_TTL_SECONDS, "agents", lambda: _check_agents(dialog_manager)
+    )
+    storage_available = await cached(PROBE_TTL_SECONDS, "storage", _check_storage)
 
     # Определяем общий статус
     if agents_available and storage_available:
@@ -76,7 +77,7 @@ async def health_check(
 
     return HealthResponse(
         status=status,
-        timestamp=datetime.now(),
+        timestamp=datetime.fromtimestamp(current_time, tz=timezone.utc),
         version=settings.app_version,
         environment=settings.environment,
         uptime_seconds=uptime_seconds,
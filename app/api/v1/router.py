@@ -1,20 +1,26 @@
+from typing import Any
+
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 from .dialogue import router as dialogue_router
 from .health import router as health_router
 
-# Создаем основной роутер для API v1
-api_router = APIRouter()
+
+class _ORJSONResponse(ORJSONResponse):
+    """Ответ через orjson с откатом на стандартный json для целых длиннее 64 бит."""
+
+    def render(self, content: Any) -> bytes:
+        try:
+            return super().render(content)
+        except TypeError:
+            # Метаданные сообщений могут содержать произвольно большие целые
+            return JSONResponse.render(self, content)
+
+
+# Создаем основной роутер для API v1 (ответы сериализуются через orjson)
+api_router = APIRouter(default_response_class=_ORJSONResponse)
 
 # Подключаем роутеры модулей
-api_router.include_router(
-    dialogue_router,
-    prefix="/dialogue",
-    tags=["dialogue"],
-)
-
-api_router.include_router(
-    health_router,
-    prefix="",
-    tags=["health"],
-)
+api_router.include_router(dialogue_router, prefix="/dialogue")
+api_router.include_router(health_router)
@@ -1,16 +1,38 @@
-from .config import settings
-from .exceptions import AgentException, DialogException, EmbeddingException, ValidationException
-from .models import CustomerInfo, DialogCreate, DialogHistory, DialogResponse, MessageRequest
+from .config import get_settings, settings
+from .exceptions import (
+    AgentException,
+    DialogException,
+    EmbeddingException,
+    NotFoundDialogException,
+    ValidationException,
+)
+from .models import (
+    CleanupResponse,
+    ClosedCleanupResponse,
+    CustomerInfo,
+    DeleteResponse,
+    DialogCreate,
+    DialogHistory,
+    DialogResponse,
+    DialogStatusResponse,
+    MessageRequest,
+)
 
 __all__ = [
     "settings",
+    "get_settings",
     "AgentException",
     "DialogException",
     "EmbeddingException",
+    "NotFoundDialogException",
     "ValidationException",
+    "CleanupResponse",
+    "ClosedCleanupResponse",
     "CustomerInfo",
+    "DeleteResponse",
     "DialogCreate",
     "DialogHistory",
     "DialogResponse",
+    "DialogStatusResponse",
     "MessageRequest",
 ]
@@ -1,7 +1,8 @@
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
-from pydantic import Field
+from pydantic import Field, PrivateAttr
 from pydantic_settings import BaseSettings
 
 
@@ -65,6 +66,12 @@ class Settings(BaseSettings):
         default=2000, description="Максимальная длина сообщения пользователя"
     )
     dialog_timeout_minutes: int = Field(default=30, description="Таймаут диалога в минутах")
+    max_summary_length: int = Field(
+        default=2000, description="Максимальная длина краткого содержания диалога"
+    )
+    dialog_cache_size: int = Field(
+        default=1000, description="Максимальное количество диалогов в кэше памяти"
+    )
 
     # Настройки агентов
     router_temperature: float = Field(default=0.1, description="Температура для роутера")
@@ -78,12 +85,17 @@ class Settings(BaseSettings):
         "case_sensitive": False,
     }
 
+    _is_production: bool = PrivateAttr(default=False)
+    _cors_origins: list[str] = PrivateAttr(default_factory=list)
+    _storage_str: str = PrivateAttr(default="")
+
     def __init__(self, **data: Any) -> None:
         """
-        Инициализация настроек с созданием необходимых директорий.
+        Инициализация настроек с вычислением производных значений.
 
-        Автоматически создает директории для хранения данных и настраивает
-        режим отладки в зависимости от окружения.
+        Настраивает режим отладки в зависимости от окружения и один раз
+        вычисляет признак продакшена, список CORS origins и строковый путь
+        хранилища, чтобы обращение к ним не требовало повторных вычислений.
 
         Args:
         ----
@@ -92,14 +104,19 @@ class Settings(BaseSettings):
         """
         super().__init__(**data)
 
-        # Создаем директории если они не существуют
-        self.dialog_storage_path.mkdir(parents=True, exist_ok=True)
+        environment = self.environment.lower()
 
         # Настраиваем debug режим
-        if self.environment.lower() in ["development", "dev"]:
-            self.debug = True
+        if environment in ("development", "dev"):
             self.debug = True
 
+        self._is_production = environment in ("production", "prod")
+        # В продакшене origins настраиваются отдельно, в разработке разрешаем все
+        self._cors_origins = [] if self._is_production else ["*"]
+
+        # Строковый путь хранилища для быстрого построения путей к файлам
+        self._storage_str = str(self.dialog_storage_path)
+
     @property
     def is_production(self) -> bool:
         """
@@ -115,7 +132,7 @@ class Settings(BaseSettings):
             True если приложение запущено в продакшене.
 
         """
-        return self.environment.lower() in ["production", "prod"]
+        return self._is_production
 
     @property
     def cors_origins(self) -> list[str]:
@@ -132,16 +149,24 @@ class Settings(BaseSettings):
             Список разрешенных origins для CORS.
 
         """
-        if self.is_production:
-            return []  # В продакшене настраивается отдельно
-        return ["*"]  # В разработке разрешаем все
+        return self._cors_origins
+
+    def ensure_storage(self) -> None:
+        """
+        Создание директорий для хранения данных.
+
+        Вызывается один раз при запуске приложения, чтобы создание
+        настроек не приводило к обращениям к файловой системе.
+        """
+        self.dialog_storage_path.mkdir(parents=True, exist_ok=True)
 
-    def get_dialog_file_path(self, dialog_id: str) -> Path:
+    def get_dialog_file_path(self, dialog_id: str) -> str:
         """
         Получение пути к файлу диалога.
 
         Формирует полный путь к JSON файлу для сохранения или загрузки
-        диалога на основе его идентификатора.
+        диалога на основе его идентификатора. Путь возвращается строкой,
+        чтобы не создавать объект Path на каждую операцию с файлом.
 
         Args:
         ----
@@ -149,12 +174,48 @@ class Settings(BaseSettings):
 
         Returns:
         -------
-        Path
+        str
             Путь к файлу диалога в файловой системе.
 
         """
-        return self.dialog_storage_path / f"{dialog_id}.json"
+        return self._storage_str + "/" + dialog_id + ".json"
+
+    def get_dialog_meta_file_path(self, dialog_id: str) -> str:
+        """
+        Получение пути к файлу метаданных диалога.
+
+        Файл метаданных содержит только статус, счетчики и временные метки
+        диалога и позволяет получать краткий статус без загрузки сообщений.
+
+        Args:
+        ----
+            dialog_id (str): Уникальный идентификатор диалога.
+
+        Returns:
+        -------
+        str
+            Путь к файлу метаданных диалога в файловой системе.
+
+        """
+        return self._storage_str + "/" + dialog_id + ".meta.json"
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Получение настроек приложения.
+
+    Настройки загружаются из окружения и .env файла только при первом
+    вызове, последующие вызовы возвращают тот же экземпляр.
+
+    Returns
+    -------
+    Settings
+        Единственный экземпляр настроек приложения.
+
+    """
+    return Settings()
 
 
 # Глобальный экземпляр настроек
-settings = Settings()
+settings = get_settings()
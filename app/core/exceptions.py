@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, ClassVar
 
 
 class CallCenterException(Exception):
@@ -13,9 +13,19 @@ class CallCenterException(Exception):
     ----------
         message: Основное сообщение об ошибке.
         details: Словарь с дополнительной технической информацией.
+        status_code: HTTP статус, которым ошибка возвращается клиенту.
+        error_type: Имя класса ошибки для ответа клиенту.
 
     """
 
+    status_code: int = 400
+    error_type: ClassVar[str] = "CallCenterException"
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Сохранение имени подкласса, чтобы не вычислять его при каждой ошибке."""
+        super().__init_subclass__(**kwargs)
+        cls.error_type = cls.__name__
+
     def __init__(self, message: str, details: dict[str, Any] | None = None) -> None:
         """
         Инициализация исключения.
@@ -48,6 +58,19 @@ class DialogException(CallCenterException):
     состоянием диалогов с клиентами.
     """
 
+    status_code = 500
+
+
+class NotFoundDialogException(DialogException):
+    """
+    Исключение для обращения к несуществующему диалогу.
+
+    Возникает, когда диалог с указанным идентификатором отсутствует
+    в хранилище.
+    """
+
+    status_code = 404
+
 
 class EmbeddingException(CallCenterException):
     """
@@ -1,7 +1,22 @@
+import re
 from datetime import datetime
-from typing import Any, Optional
+from typing import Any, Literal, Optional
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from .config import settings
+
+# Предкомпилированные проверки для валидаторов контактных данных
+_HAS_DIGIT = re.compile(r"\d").search
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$").match
+
+# Допустимые значения перечислимых полей
+DialogPriority = Literal["low", "normal", "high", "urgent"]
+MessageType = Literal["user", "agent", "system"]
+DialogStatus = Literal["active", "closed", "escalated", "pending"]
+
+# Лимит длины сообщения задается в настройках
+_MAX_MESSAGE_LENGTH = settings.max_message_length
 
 
 class CustomerInfo(BaseModel):
@@ -40,7 +55,7 @@ class CustomerInfo(BaseModel):
             Валидированный email
 
         """
-        if v and "@" not in v:
+        if v and not _EMAIL_RE(v):
             raise ValueError("Некорректный email адрес")
         return v
 
@@ -59,7 +74,7 @@ class CustomerInfo(BaseModel):
             Валидированный телефон
 
         """
-        if v and not any(c.isdigit() for c in v):
+        if v and not _HAS_DIGIT(v):
             raise ValueError("Номер телефона должен содержать цифры")
         return v
 
@@ -81,29 +96,11 @@ class DialogCreate(BaseModel):
     """
 
     customer_info: CustomerInfo = Field(..., description="Информация о клиенте")
-    initial_message: Optional[str] = Field(None, description="Начальное сообщение", max_length=2000)
+    initial_message: Optional[str] = Field(
+        None, description="Начальное сообщение", max_length=_MAX_MESSAGE_LENGTH
+    )
     source: str = Field(default="api", description="Источник диалога")
-    priority: str = Field(default="normal", description="Приоритет диалога")
-
-    @field_validator("priority")
-    @classmethod
-    def validate_priority(cls, v: str) -> str:
-        """
-        Валидация приоритета диалога.
-
-        Args:
-        ----
-            v: Приоритет для валидации
-
-        Returns:
-        -------
-            Валидированный приоритет
-
-        """
-        allowed_priorities = ["low", "normal", "high", "urgent"]
-        if v not in allowed_priorities:
-            raise ValueError(f"Приоритет должен быть одним из: {allowed_priorities}")
-        return v
+    priority: DialogPriority = Field(default="normal", description="Приоритет диалога")
 
 
 class MessageRequest(BaseModel):
@@ -117,33 +114,17 @@ class MessageRequest(BaseModel):
     ----------
         message: Текст сообщения для отправки.
         message_type: Тип отправителя (user/agent/system).
-        metadata: Дополнительные данные о сообщении.
+        metadata: Дополнительные данные о сообщении (None, если не переданы).
 
     """
 
-    message: str = Field(..., description="Текст сообщения", min_length=1, max_length=2000)
-    message_type: str = Field(default="user", description="Тип сообщения")
-    metadata: dict[str, Any] = Field(default_factory=dict, description="Метаданные сообщения")
+    model_config = ConfigDict(extra="forbid", frozen=True)
 
-    @field_validator("message_type")
-    @classmethod
-    def validate_message_type(cls, v: str) -> str:
-        """
-        Валидация типа сообщения.
-
-        Args:
-        ----
-            v: Тип сообщения для валидации
-
-        Returns:
-        -------
-            Валидированный тип сообщения
-
-        """
-        allowed_types = ["user", "agent", "system"]
-        if v not in allowed_types:
-            raise ValueError(f"Тип сообщения должен быть одним из: {allowed_types}")
-        return v
+    message: str = Field(
+        ..., description="Текст сообщения", min_length=1, max_length=_MAX_MESSAGE_LENGTH
+    )
+    message_type: MessageType = Field(default="user", description="Тип сообщения")
+    metadata: Optional[dict[str, Any]] = Field(default=None, description="Метаданные сообщения")
 
 
 class DialogMessage(BaseModel):
@@ -161,22 +142,26 @@ class DialogMessage(BaseModel):
         message: Текст сообщения.
         agent_name: Имя агента, если отправитель - агент.
         timestamp: Время отправки сообщения.
-        metadata: Дополнительные данные о сообщении.
+        metadata: Дополнительные данные о сообщении (None, если отсутствуют).
 
     """
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     id: str = Field(..., description="Идентификатор сообщения")
     dialog_id: str = Field(..., description="Идентификатор диалога")
     sender: str = Field(..., description="Отправитель (user/agent/system)")
     message: str = Field(..., description="Текст сообщения")
     agent_name: Optional[str] = Field(None, description="Имя агента-отправителя")
     timestamp: datetime = Field(..., description="Время отправки")
-    metadata: dict[str, Any] = Field(default_factory=dict, description="Метаданные")
+    metadata: Optional[dict[str, Any]] = Field(default=None, description="Метаданные")
 
 
 class DialogResponse(BaseModel):
     """Ответ на сообщение в диалоге."""
 
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     dialog_id: str = Field(..., description="Идентификатор диалога")
     message_id: str = Field(..., description="Идентификатор сообщения")
     agent_response: str = Field(..., description="Ответ агента")
@@ -193,7 +178,7 @@ class DialogHistory(BaseModel):
 
     dialog_id: str = Field(..., description="Идентификатор диалога")
     customer_info: CustomerInfo = Field(..., description="Информация о клиенте")
-    status: str = Field(..., description="Статус диалога")
+    status: DialogStatus = Field(..., description="Статус диалога")
     created_at: datetime = Field(..., description="Время создания")
     updated_at: datetime = Field(..., description="Время последнего обновления")
     messages: list[DialogMessage] = Field(..., description="Список сообщений")
@@ -201,25 +186,42 @@ class DialogHistory(BaseModel):
     conversation_summary: Optional[str] = Field(None, description="Краткое содержание")
     metadata: dict[str, Any] = Field(default_factory=dict, description="Метаданные диалога")
 
-    @field_validator("status")
-    @classmethod
-    def validate_status(cls, v: str) -> str:
-        """
-        Валидация статуса диалога.
 
-        Args:
-        ----
-            v: Статус для валидации
+class DialogStatusResponse(BaseModel):
+    """Краткий статус диалога."""
 
-        Returns:
-        -------
-            Валидированный статус
+    model_config = ConfigDict(frozen=True)
 
-        """
-        allowed_statuses = ["active", "closed", "escalated", "pending"]
-        if v not in allowed_statuses:
-            raise ValueError(f"Статус должен быть одним из: {allowed_statuses}")
-        return v
+    dialog_id: str = Field(..., description="Идентификатор диалога")
+    status: DialogStatus = Field(..., description="Статус диалога")
+    current_agent: Optional[str] = Field(None, description="Текущий активный агент")
+    message_count: int = Field(..., description="Количество сообщений в истории")
+    created_at: datetime = Field(..., description="Время создания")
+    updated_at: datetime = Field(..., description="Время последнего обновления")
+    customer_name: str = Field(..., description="Имя клиента")
+
+
+class CleanupResponse(BaseModel):
+    """Результат очистки неактивных диалогов."""
+
+    closed_dialogs: int = Field(..., description="Количество закрытых диалогов")
+    message: str = Field(..., description="Сообщение о результате")
+
+
+class ClosedCleanupResponse(BaseModel):
+    """Результат удаления старых закрытых диалогов."""
+
+    deleted_count: int = Field(..., description="Количество удаленных диалогов")
+    older_than_days: int = Field(..., description="Порог возраста диалогов в днях")
+    message: str = Field(..., description="Сообщение о результате")
+
+
+class DeleteResponse(BaseModel):
+    """Результат удаления диалога."""
+
+    success: bool = Field(..., description="Успешность удаления")
+    dialog_id: str = Field(..., description="Идентификатор диалога")
+    message: str = Field(..., description="Сообщение о результате")
 
 
 class HealthResponse(BaseModel):
@@ -1,39 +1,125 @@
+import asyncio
+import contextlib
 import logging
+import logging.handlers
+import queue
 import sys
+import time
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator, Awaitable, Callable
+from typing import AsyncGenerator
 
+import orjson
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-from starlette.responses import Response
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.routing import Route
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.api.v1.router import api_router
 from app.core.config import settings
-from app.core.exceptions import CallCenterException
+from app.core.exceptions import CallCenterException, DialogException, ValidationException
+from app.services import DialogManager
+
+request_logger = logging.getLogger("app.requests")
 
 
 # Настройка логирования
-def setup_logging() -> None:
+def setup_logging() -> logging.handlers.QueueListener:
     """
     Настройка системы логирования приложения.
 
     Конфигурирует базовые настройки логирования с использованием
     параметров из конфигурации и устанавливает уровни логирования
-    для внешних библиотек для уменьшения шума в логах.
+    для внешних библиотек для уменьшения шума в логах. Записи логов
+    передаются через очередь и выводятся в stdout отдельным потоком,
+    чтобы запись в поток вывода не блокировала event loop.
+
+    Returns
+    -------
+    logging.handlers.QueueListener
+        Запущенный обработчик очереди логов, который нужно остановить
+        при завершении работы.
+
     """
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter(settings.log_format))
+
+    # Полное форматирование записи выполняется в потоке обработчика очереди
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    # При повторном запуске lifespan заменяем обработчик очереди, чей
+    # обработчик-слушатель был остановлен при предыдущем завершении
+    root_logger = logging.getLogger()
+    for handler in root_logger.handlers[:]:
+        if isinstance(handler, logging.handlers.QueueHandler):
+            root_logger.removeHandler(handler)
+
     logging.basicConfig(
         level=getattr(logging, settings.log_level.upper()),
-        format=settings.log_format,
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-        ],
+        handlers=[queue_handler],
     )
 
+    listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    listener.start()
+
     # Устанавливаем уровень логирования для внешних библиотек
     logging.getLogger("httpx").setLevel(logging.WARNING)
     logging.getLogger("openai").setLevel(logging.WARNING)
 
+    return listener
+
+
+def warm_up_models(app: FastAPI) -> None:
+    """
+    Предварительная сборка схем моделей ответов и OpenAPI.
+
+    Проверяет, что схемы всех моделей ответов полностью собраны, и заранее
+    генерирует OpenAPI схему, чтобы первый запрос нового воркера
+    не оплачивал эту работу.
+
+    Args:
+    ----
+        app (FastAPI): Экземпляр FastAPI приложения.
+
+    """
+    for route in app.routes:
+        if not isinstance(route, APIRoute):
+            continue
+        model = route.response_model
+        if isinstance(model, type) and issubclass(model, BaseModel):
+            model.model_rebuild()
+
+    app.openapi()
+
+
+async def periodic_cleanup(dialog_manager: DialogManager) -> None:
+    """
+    Периодическая очистка неактивных диалогов.
+
+    Запускается одной фоновой задачей на процесс и закрывает неактивные
+    диалоги несколько раз за период таймаута, вместо запуска очистки
+    после каждого сообщения.
+
+    Args:
+    ----
+        dialog_manager (DialogManager): Менеджер диалогов приложения.
+
+    """
+    logger = logging.getLogger(__name__)
+    interval = settings.dialog_timeout_minutes * 60 / 4
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await dialog_manager.cleanup_inactive_dialogs()
+        except Exception as e:
+            logger.error("Ошибка периодической очистки диалогов: %s", e)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
@@ -41,8 +127,10 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     Управление жизненным циклом FastAPI приложения.
 
     Обрабатывает события startup и shutdown приложения. При запуске
-    настраивает логирование, создает необходимые директории и логирует
-    информацию о конфигурации. При завершении выполняет cleanup.
+    настраивает логирование, создает необходимые директории, единственный
+    экземпляр менеджера диалогов с задачей периодической очистки и логирует
+    информацию о конфигурации. При завершении останавливает фоновые задачи
+    и сохраняет диалоги, ожидающие записи.
 
     Args:
     ----
@@ -54,20 +142,32 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     """
     # Startup
-    setup_logging()
+    app.state.log_listener = setup_logging()
     logger = logging.getLogger(__name__)
     logger.info(f"Запуск приложения {settings.app_name} v{settings.app_version}")
     logger.info(f"Окружение: {settings.environment}")
     logger.info(f"Режим отладки: {settings.debug}")
 
     # Создаем необходимые директории
-    settings.dialog_storage_path.mkdir(parents=True, exist_ok=True)
+    settings.ensure_storage()
     logger.info(f"Хранилище диалогов: {settings.dialog_storage_path}")
 
+    warm_up_models(app)
+
+    # Менеджер диалогов создается один раз на процесс
+    app.state.dialog_manager = DialogManager()
+    cleanup_task = asyncio.create_task(periodic_cleanup(app.state.dialog_manager))
+
     yield
 
     # Shutdown
+    cleanup_task.cancel()
+    with contextlib.suppress(asyncio.CancelledError):
+        await cleanup_task
+    await app.state.dialog_manager.flush_pending()
+
     logger.info("Завершение работы приложения")
+    app.state.log_listener.stop()
 
 
 # Создание FastAPI приложения
@@ -78,6 +178,7 @@ app = FastAPI(
     openapi_url=f"{settings.api_prefix}/openapi.json",
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
@@ -90,10 +191,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Сжатие крупных JSON ответов (истории диалогов)
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 
 # Глобальный обработчик исключений
 @app.exception_handler(CallCenterException)
-async def call_center_exception_handler(request: Request, exc: CallCenterException) -> JSONResponse:
+async def call_center_exception_handler(
+    request: Request, exc: CallCenterException
+) -> ORJSONResponse:
     """
     Обработчик специфичных исключений системы колл-центра.
 
@@ -107,15 +213,15 @@ async def call_center_exception_handler(request: Request, exc: CallCenterExcepti
 
     Returns:
     -------
-    JSONResponse
-        JSON ответ с информацией об ошибке и HTTP статусом 400.
+    ORJSONResponse
+        JSON ответ с информацией об ошибке и HTTP статусом исключения.
 
     """
-    return JSONResponse(
-        status_code=400,
+    return ORJSONResponse(
+        status_code=exc.status_code,
         content={
             "error": {
-                "type": exc.__class__.__name__,
+                "type": exc.error_type,
                 "message": exc.message,
                 "details": exc.details,
             }
@@ -123,8 +229,35 @@ async def call_center_exception_handler(request: Request, exc: CallCenterExcepti
     )
 
 
+@app.exception_handler(DialogException)
+@app.exception_handler(ValidationException)
+async def dialog_exception_handler(request: Request, exc: CallCenterException) -> ORJSONResponse:
+    """
+    Обработчик ошибок работы с диалогами.
+
+    Преобразует исключения менеджера диалогов в HTTP ответ со статусом,
+    заданным в классе исключения (400, 404 или 500), вместо обработки
+    в каждом эндпоинте.
+
+    Args:
+    ----
+        request (Request): HTTP запрос, вызвавший исключение.
+        exc (CallCenterException): Исключение диалога или валидации.
+
+    Returns:
+    -------
+    ORJSONResponse
+        JSON ответ с описанием ошибки в поле detail.
+
+    """
+    logger = logging.getLogger(__name__)
+    logger.warning("Ошибка обработки запроса %s: %s", request.url.path, exc.message)
+
+    return ORJSONResponse(status_code=exc.status_code, content={"detail": exc.message})
+
+
 @app.exception_handler(Exception)
-async def general_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+async def general_exception_handler(request: Request, exc: Exception) -> ORJSONResponse:
     """
     Общий обработчик необработанных исключений.
 
@@ -139,14 +272,14 @@ async def general_exception_handler(request: Request, exc: Exception) -> JSONRes
 
     Returns:
     -------
-    JSONResponse
+    ORJSONResponse
         JSON ответ с информацией об ошибке и HTTP статусом 500.
 
     """
     logger = logging.getLogger(__name__)
-    logger.error(f"Необработанное исключение: {exc}", exc_info=True)
+    logger.error("Необработанное исключение: %s", exc, exc_info=True)
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": {
@@ -158,100 +291,167 @@ async def general_exception_handler(request: Request, exc: Exception) -> JSONRes
     )
 
 
-@app.middleware("http")
-async def log_requests(
-    request: Request, call_next: Callable[[Request], Awaitable[Response]]
-) -> Response:
+class RequestLogMiddleware:
     """
-    Middleware для логирования HTTP запросов.
+    ASGI middleware для логирования HTTP запросов.
 
     Логирует информацию о всех входящих HTTP запросах включая
     метод, путь, статус ответа и время обработки для мониторинга
-    производительности и диагностики.
+    производительности и диагностики. Реализован как чистое ASGI
+    приложение без промежуточных объектов запроса и ответа.
+    """
 
-    Args:
-    ----
-        request (Request): Входящий HTTP запрос.
-        call_next: Следующий обработчик в цепочке middleware.
+    def __init__(self, app: ASGIApp) -> None:
+        """
+        Инициализация middleware.
 
-    Returns:
-    -------
-    Response
-        HTTP ответ от следующего обработчика.
+        Args:
+        ----
+            app (ASGIApp): Следующее ASGI приложение в цепочке.
 
-    """
-    logger = logging.getLogger(__name__)
-    start_time = __import__("time").time()
+        """
+        self.app = app
 
-    response = await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Обработка ASGI вызова с замером времени и статуса ответа.
 
-    process_time = __import__("time").time() - start_time
-    logger.info(
-        f"{request.method} {request.url.path} - "
-        f"Status: {response.status_code} - "
-        f"Time: {process_time:.3f}s"
-    )
+        Args:
+        ----
+            scope (Scope): ASGI scope запроса.
+            receive (Receive): Канал получения сообщений от клиента.
+            send (Send): Канал отправки сообщений клиенту.
 
-    return response
+        """
+        # При отключенном уровне INFO запрос проходит без замеров и обертки send
+        if scope["type"] != "http" or not request_logger.isEnabledFor(logging.INFO):
+            await self.app(scope, receive, send)
+            return
 
+        start_time = time.perf_counter()
+        status_code = 500
 
-# Подключение роутеров
-app.include_router(api_router, prefix=settings.api_prefix)
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
 
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            process_time = time.perf_counter() - start_time
+            request_logger.info(
+                "%s %s - Status: %s - Time: %.3fs",
+                scope["method"],
+                scope["path"],
+                status_code,
+                process_time,
+            )
 
-# Корневой эндпоинт
-@app.get("/")
-async def root() -> dict[str, str]:
-    """
-    Корневой эндпоинт приложения.
 
-    Предоставляет базовую информацию о сервисе и ссылки на
-    важные эндпоинты для первичного ознакомления с API.
+app.add_middleware(RequestLogMiddleware)
 
-    Returns
-    -------
-    dict
-        Словарь с метаинформацией о приложении и полезными ссылками.
 
+class StaticJSONEndpoint:
     """
-    return {
-        "name": settings.app_name,
-        "version": settings.app_version,
-        "environment": settings.environment,
-        "api_docs": "/docs",
-        "health_check": "/health",
-    }
-
-
-# Эндпоинт для проверки здоровья на корневом уровне
-@app.get("/health")
-async def health() -> dict[str, str]:
+    ASGI эндпоинт, отдающий заранее сериализованный JSON.
+
+    Используется для статичных служебных ответов, которые часто
+    запрашиваются системами мониторинга: тело ответа сериализуется
+    один раз при создании, а запрос не проходит через маршрутизацию
+    FastAPI, внедрение зависимостей и сериализацию ответа.
     """
-    Простая проверка здоровья приложения на корневом уровне.
 
-    Быстрая проверка доступности сервиса без детальной диагностики.
-    Используется для базового мониторинга и проверки работоспособности.
+    def __init__(self, content: dict[str, str]) -> None:
+        """
+        Инициализация эндпоинта.
+
+        Args:
+        ----
+            content (dict[str, str]): Содержимое JSON ответа.
+
+        """
+        self.body = orjson.dumps(content)
+        self.headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(self.body)).encode()),
+        ]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Отправка готового ответа.
+
+        Args:
+        ----
+            scope (Scope): ASGI scope запроса.
+            receive (Receive): Канал получения сообщений от клиента.
+            send (Send): Канал отправки сообщений клиенту.
+
+        """
+        await send({"type": "http.response.start", "status": 200, "headers": self.headers})
+        await send({"type": "http.response.body", "body": self.body})
+
+
+# Корневой эндпоинт с базовой информацией о сервисе и полезными ссылками
+app.router.routes.append(
+    Route(
+        "/",
+        StaticJSONEndpoint(
+            {
+                "name": settings.app_name,
+                "version": settings.app_version,
+                "environment": settings.environment,
+                "api_docs": "/docs",
+                "health_check": "/health",
+            }
+        ),
+        methods=["GET"],
+    )
+)
 
-    Returns
-    -------
-    dict
-        Словарь с базовой информацией о статусе приложения.
+# Простая проверка здоровья на корневом уровне без детальной диагностики
+app.router.routes.append(
+    Route(
+        "/health",
+        StaticJSONEndpoint(
+            {
+                "status": "healthy",
+                "service": settings.app_name,
+                "version": settings.app_version,
+            }
+        ),
+        methods=["GET"],
+    )
+)
 
-    """
-    return {
-        "status": "healthy",
-        "service": settings.app_name,
-        "version": settings.app_version,
-    }
+
+# Подключение роутеров
+app.include_router(api_router, prefix=settings.api_prefix)
 
 
 if __name__ == "__main__":
     import uvicorn
 
+    # uvloop и httptools входят в uvicorn[standard], но могут отсутствовать локально
+    try:
+        import httptools  # noqa: F401
+        import uvloop  # noqa: F401
+
+        loop, http = "uvloop", "httptools"
+    except ImportError:
+        loop, http = "asyncio", "h11"
+
     uvicorn.run(
         "app.main:app",
         host=settings.api_host,
         port=settings.api_port,
         reload=settings.debug,
         log_level=settings.log_level.lower(),
+        loop=loop,
+        http=http,
+        # Запросы уже логируются в RequestLogMiddleware
+        access_log=False,
+        proxy_headers=False,
+        server_header=False,
     )
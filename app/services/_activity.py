@@ -0,0 +1,106 @@
+import heapq
+import time
+from typing import Dict, List, Tuple
+
+
+class ActivityTracker:
+    """
+    Учет времени последней активности диалогов.
+
+    Хранит монотонные отметки времени и min-кучу пар
+    (время активности, идентификатор диалога), поэтому поиск
+    просроченных диалогов не требует обхода всех активных диалогов:
+    извлечение останавливается на первой непросроченной записи.
+    Устаревшие записи кучи удаляются лениво.
+
+    """
+
+    def __init__(self) -> None:
+        """Инициализация пустого индекса активности."""
+        self._activity: Dict[str, float] = {}
+        self._heap: List[Tuple[float, str]] = []
+
+    def __len__(self) -> int:
+        """Количество отслеживаемых диалогов."""
+        return len(self._activity)
+
+    def __contains__(self, dialog_id: object) -> bool:
+        """Проверка, отслеживается ли диалог."""
+        return dialog_id in self._activity
+
+    def touch(self, dialog_id: str) -> None:
+        """
+        Отметка активности диалога текущим временем.
+
+        Args:
+        ----
+            dialog_id: Идентификатор диалога
+
+        """
+        timestamp = time.monotonic()
+        self._activity[dialog_id] = timestamp
+        heapq.heappush(self._heap, (timestamp, dialog_id))
+
+        # Не даем куче разрастаться из-за устаревших записей
+        if len(self._heap) > 2 * len(self._activity) + 64:
+            self._compact()
+
+    def discard(self, dialog_id: str) -> None:
+        """
+        Прекращение отслеживания диалога.
+
+        Args:
+        ----
+            dialog_id: Идентификатор диалога
+
+        """
+        self._activity.pop(dialog_id, None)
+
+    def expire(self, dialog_id: str) -> None:
+        """
+        Возврат диалога в число просроченных.
+
+        Диалог будет снова возвращен следующим вызовом pop_expired,
+        если до этого по нему не было новой активности.
+
+        Args:
+        ----
+            dialog_id: Идентификатор диалога
+
+        """
+        if dialog_id in self._activity:
+            return
+
+        timestamp = float("-inf")
+        self._activity[dialog_id] = timestamp
+        heapq.heappush(self._heap, (timestamp, dialog_id))
+
+    def pop_expired(self, timeout_seconds: float) -> List[str]:
+        """
+        Извлечение диалогов, неактивных дольше заданного времени.
+
+        Args:
+        ----
+            timeout_seconds: Допустимое время неактивности в секундах
+
+        Returns:
+        -------
+            Идентификаторы просроченных диалогов
+
+        """
+        cutoff = time.monotonic() - timeout_seconds
+        expired = []
+
+        while self._heap and self._heap[0][0] < cutoff:
+            timestamp, dialog_id = heapq.heappop(self._heap)
+            # Запись актуальна, только если диалог не обновлялся после нее
+            if self._activity.get(dialog_id) == timestamp:
+                del self._activity[dialog_id]
+                expired.append(dialog_id)
+
+        return expired
+
+    def _compact(self) -> None:
+        """Перестроение кучи только из актуальных записей."""
+        self._heap = [(timestamp, dialog_id) for dialog_id, timestamp in self._activity.items()]
+        heapq.heapify(self._heap)
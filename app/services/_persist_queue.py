@@ -0,0 +1,258 @@
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+from app.core.models import DialogHistory
+
+logger = logging.getLogger(__name__)
+
+
+class WriteCoalescer:
+    """
+    Объединение записей диалогов на диск в пакеты.
+
+    Вместо записи файла после каждого сообщения диалог помечается как
+    измененный, а через небольшую задержку все измененные диалоги
+    сохраняются одним пакетом. Несколько изменений одного диалога
+    за это время приводят к единственной записи. Запись выполняет
+    единственная фоновая задача, которая работает, пока есть изменения.
+    Записи одного диалога выполняются строго по очереди, а неудачные
+    записи повторяются с экспоненциально растущей задержкой. После
+    max_attempts неудачных попыток подряд изменения диалога отбрасываются.
+
+    Attributes
+    ----------
+        delay: Задержка перед сохранением пакета в секундах.
+        max_attempts: Число попыток записи диалога до отказа от нее.
+
+    """
+
+    def __init__(
+        self,
+        save: Callable[[DialogHistory], Awaitable[None]],
+        delay: float = 0.1,
+        max_attempts: int = 8,
+    ) -> None:
+        """
+        Инициализация очереди записи.
+
+        Args:
+        ----
+            save: Асинхронная функция сохранения одного диалога.
+            delay: Задержка перед сохранением пакета в секундах.
+            max_attempts: Число попыток записи диалога до отказа от нее.
+
+        """
+        self._save = save
+        self.delay = delay
+        self.max_attempts = max_attempts
+        self._dirty: Dict[str, DialogHistory] = {}
+        self._inflight: Dict[str, DialogHistory] = {}
+        # Блокировка и число ее пользователей для каждого записываемого диалога
+        self._locks: Dict[str, Tuple[asyncio.Lock, int]] = {}
+        # Число неудачных попыток подряд и время следующей попытки (monotonic)
+        self._failures: Dict[str, Tuple[int, float]] = {}
+        self._flush_task: Optional[asyncio.Task[None]] = None
+        self._closing = False
+
+    def mark_dirty(self, dialog_history: DialogHistory) -> None:
+        """
+        Пометка диалога как требующего сохранения.
+
+        Args:
+        ----
+            dialog_history: Актуальная история диалога.
+
+        """
+        self._dirty[dialog_history.dialog_id] = dialog_history
+        self._schedule()
+
+    async def save_now(self, dialog_history: DialogHistory) -> None:
+        """
+        Немедленное сохранение диалога с ожиданием записи на диск.
+
+        Запись выполняется после уже начатой записи того же диалога,
+        поэтому более старая версия не может перезаписать новую.
+        При ошибке диалог остается в очереди для повторной записи.
+
+        Args:
+        ----
+            dialog_history: Актуальная история диалога.
+
+        """
+        self._dirty.pop(dialog_history.dialog_id, None)
+
+        async with self._dialog_lock(dialog_history.dialog_id):
+            try:
+                await self._save(dialog_history)
+            except Exception:
+                self.mark_dirty(dialog_history)
+                raise
+
+    def get_pending(self, dialog_id: str) -> Optional[DialogHistory]:
+        """
+        Получение еще не сохраненной версии диалога.
+
+        Args:
+        ----
+            dialog_id: Идентификатор диалога
+
+        Returns:
+        -------
+            История диалога, ожидающая записи, или None
+
+        """
+        # Записываемая в данный момент версия тоже еще не на диске
+        return self._dirty.get(dialog_id) or self._inflight.get(dialog_id)
+
+    async def discard(self, dialog_id: str) -> None:
+        """
+        Отмена ожидающей записи диалога.
+
+        Дожидается завершения уже начатой записи, чтобы после возврата
+        файлы диалога больше не перезаписывались.
+
+        Args:
+        ----
+            dialog_id: Идентификатор диалога
+
+        """
+        self._dirty.pop(dialog_id, None)
+        self._inflight.pop(dialog_id, None)
+        self._failures.pop(dialog_id, None)
+
+        async with self._dialog_lock(dialog_id):
+            pass
+
+    async def flush(self) -> None:
+        """Сохранение всех измененных диалогов одним пакетом."""
+        await self._flush(due_only=False)
+
+    async def close(self) -> None:
+        """Дожидается текущей записи и сохраняет оставшиеся изменения."""
+        self._closing = True
+        if self._flush_task is not None and not self._flush_task.done():
+            await self._flush_task
+        await self.flush()
+
+        if self._dirty:
+            logger.error("Не удалось сохранить диалоги при завершении: %s", ", ".join(self._dirty))
+
+    async def _flush(self, due_only: bool) -> None:
+        """
+        Сохранение пакета измененных диалогов.
+
+        Args:
+        ----
+            due_only: Пропускать диалоги, время повторной попытки
+                которых еще не наступило.
+
+        """
+        now = time.monotonic()
+        batch = [
+            dialog_history
+            for dialog_id, dialog_history in self._dirty.items()
+            if not due_only or self._failures.get(dialog_id, (0, now))[1] <= now
+        ]
+        if not batch:
+            return
+
+        for dialog_history in batch:
+            del self._dirty[dialog_history.dialog_id]
+            self._inflight[dialog_history.dialog_id] = dialog_history
+
+        results = await asyncio.gather(
+            *(self._write(dialog_history) for dialog_history in batch),
+            return_exceptions=True,
+        )
+        for dialog_history, result in zip(batch, results):
+            dialog_id = dialog_history.dialog_id
+            # Версия могла смениться или быть удалена во время записи
+            is_current = self._inflight.get(dialog_id) is dialog_history
+            if is_current:
+                del self._inflight[dialog_id]
+
+            if not isinstance(result, Exception):
+                self._failures.pop(dialog_id, None)
+                continue
+            # Диалог удален во время записи, повторять нечего
+            if not is_current and dialog_id not in self._dirty:
+                continue
+
+            attempts = self._failures.get(dialog_id, (0, 0.0))[0] + 1
+            if attempts >= self.max_attempts:
+                logger.error(
+                    "Диалог %s не сохранен после %d попыток, изменения отброшены: %s",
+                    dialog_id,
+                    attempts,
+                    result,
+                )
+                self._failures.pop(dialog_id, None)
+                self._dirty.pop(dialog_id, None)
+                continue
+
+            retry_delay = self.delay * 2**attempts
+            logger.warning(
+                "Ошибка отложенного сохранения диалога %s (попытка %d, повтор через %.2f с): %s",
+                dialog_id,
+                attempts,
+                retry_delay,
+                result,
+            )
+            self._failures[dialog_id] = (attempts, time.monotonic() + retry_delay)
+            # Повторяем запись, если диалог не изменен заново
+            if is_current:
+                self._dirty.setdefault(dialog_id, dialog_history)
+
+    def _schedule(self) -> None:
+        """Запуск фоновой задачи записи, если она не работает."""
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._delayed_flush())
+
+    async def _write(self, dialog_history: DialogHistory) -> None:
+        """
+        Сохранение диалога из пакета под блокировкой диалога.
+
+        Args:
+        ----
+            dialog_history: История диалога для сохранения.
+
+        """
+        async with self._dialog_lock(dialog_history.dialog_id):
+            # Запись отменена, пока ожидала блокировку
+            if self._inflight.get(dialog_history.dialog_id) is not dialog_history:
+                return
+            await self._save(dialog_history)
+
+    @asynccontextmanager
+    async def _dialog_lock(self, dialog_id: str) -> AsyncIterator[None]:
+        """
+        Блокировка записи файлов одного диалога.
+
+        Блокировка удаляется, когда ею больше никто не пользуется,
+        поэтому словарь блокировок не растет с числом диалогов.
+
+        Args:
+        ----
+            dialog_id: Идентификатор диалога
+
+        """
+        lock, users = self._locks.get(dialog_id, (asyncio.Lock(), 0))
+        self._locks[dialog_id] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._locks[dialog_id]
+            if users == 1:
+                del self._locks[dialog_id]
+            else:
+                self._locks[dialog_id] = (lock, users - 1)
+
+    async def _delayed_flush(self) -> None:
+        """Сохранение пакетов с задержкой, пока появляются новые изменения."""
+        while self._dirty and not self._closing:
+            await asyncio.sleep(self.delay)
+            await self._flush(due_only=True)
@@ -1,24 +1,113 @@
-import json
+import asyncio
+import contextlib
 import logging
+import os
 import uuid
-from datetime import datetime, timedelta
-from typing import Dict, List
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, cast
 
+import orjson
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
 
 from app.agents import AgentOrchestrator
 from app.core.config import settings
-from app.core.exceptions import DialogException, StorageException
+from app.core.exceptions import (
+    DialogException,
+    NotFoundDialogException,
+    StorageException,
+    ValidationException,
+)
 from app.core.models import (
     DialogCreate,
     DialogHistory,
     DialogMessage,
     DialogResponse,
+    DialogStatusResponse,
     MessageRequest,
 )
 
+from ._activity import ActivityTracker
+from ._persist_queue import WriteCoalescer
+
 logger = logging.getLogger(__name__)
 
+# Минимальное количество сообщений, вытесняемых из истории за раз
+_SUMMARY_BATCH_SIZE = 8
+
+
+def _new_id() -> str:
+    """Генерация идентификатора диалога или сообщения (UUID4 без дефисов)."""
+    return uuid.uuid4().hex
+
+
+def _read_file_sync(path: str) -> bytes:
+    """Синхронное чтение файла диалога целиком (выполняется в пуле потоков)."""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _load_dialog_sync(path: str) -> Dict[str, Any]:
+    """Синхронное чтение JSON-файла диалога (выполняется в пуле потоков)."""
+    return cast(Dict[str, Any], orjson.loads(_read_file_sync(path)))
+
+
+def _list_stale_dialog_files(storage_path: str, cutoff: float) -> List[str]:
+    """
+    Поиск файлов диалогов, не изменявшихся с указанного момента.
+
+    Файл диалога перезаписывается при каждом сохранении, поэтому время
+    его изменения не меньше updated_at диалога. Файлы с более поздним
+    временем изменения отбрасываются по результату stat без чтения JSON.
+    Выполняется в пуле потоков.
+
+    Args:
+    ----
+        storage_path: Директория хранения диалогов
+        cutoff: Момент отсечки (Unix timestamp)
+
+    Returns:
+    -------
+        Пути к файлам диалогов-кандидатов на удаление
+
+    """
+    with os.scandir(storage_path) as entries:
+        return [
+            entry.path
+            for entry in entries
+            # Файлы метаданных удаляются вместе с диалогом
+            if entry.name.endswith(".json")
+            and not entry.name.endswith(".meta.json")
+            and entry.stat().st_mtime < cutoff
+        ]
+
+
+def _save_dialog_sync(path: str, data: bytes) -> None:
+    """
+    Синхронная атомарная запись сериализованного диалога.
+
+    Данные пишутся во временный файл и затем подменяют
+    исходный через os.replace, поэтому читатели никогда не видят
+    частично записанный JSON. Выполняется в пуле потоков.
+
+    """
+    # В отличие от mkstemp (права 0600) права файла определяет umask,
+    # как при обычном open, и os.replace их сохраняет
+    tmp_path = f"{path}.{_new_id()}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view) :]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+        raise
+
 
 class DialogManager:
     """
@@ -32,7 +121,10 @@ class DialogManager:
     ----------
         orchestrator: Оркестратор агентов для обработки сообщений.
         storage_path: Путь к директории для сохранения диалогов.
-        active_dialogs: Кэш активных диалогов с временными метками.
+        activity: Индекс времени последней активности диалогов.
+        _lc_cache: Сконвертированная в формат LangChain история по диалогам.
+        _history_cache: LRU-кэш загруженных историй активных диалогов.
+        write_coalescer: Очередь пакетной записи диалогов на диск.
 
     """
 
@@ -41,11 +133,14 @@ class DialogManager:
         Инициализация менеджера диалогов.
 
         Создает экземпляр оркестратора агентов, настраивает пути хранения
-        и инициализирует кэш активных диалогов.
+        и инициализирует индекс активности диалогов.
         """
         self.orchestrator = AgentOrchestrator()
         self.storage_path = settings.dialog_storage_path
-        self.active_dialogs: Dict[str, datetime] = {}
+        self.activity = ActivityTracker()
+        self._lc_cache: Dict[str, List[BaseMessage]] = {}
+        self._history_cache: OrderedDict[str, DialogHistory] = OrderedDict()
+        self.write_coalescer = WriteCoalescer(self._save_dialog)
 
         logger.info("Инициализирован менеджер диалогов")
 
@@ -72,8 +167,8 @@ class DialogManager:
             При ошибке создания диалога или обработки начального сообщения.
 
         """
-        dialog_id = str(uuid.uuid4())
-        now = datetime.now()
+        dialog_id = _new_id()
+        now = datetime.now(tz=timezone.utc)
 
         try:
             # Создаем историю диалога
@@ -95,7 +190,7 @@ class DialogManager:
             # Если есть начальное сообщение, добавляем его и обрабатываем
             if dialog_create.initial_message:
                 initial_message = DialogMessage(
-                    id=str(uuid.uuid4()),
+                    id=_new_id(),
                     dialog_id=dialog_id,
                     sender="user",
                     message=dialog_create.initial_message,
@@ -113,7 +208,7 @@ class DialogManager:
 
                 # Создаем ответное сообщение агента
                 agent_message = DialogMessage(
-                    id=str(uuid.uuid4()),
+                    id=_new_id(),
                     dialog_id=dialog_id,
                     sender="agent",
                     message=agent_result["agent_response"],
@@ -127,31 +222,35 @@ class DialogManager:
 
                 # Обновляем метаданные диалога
                 dialog_history.current_agent = agent_result["current_agent"]
-                dialog_history.metadata.update(
-                    {
-                        "last_user_intent": agent_result.get("user_intent"),
-                        "last_handoff_reason": agent_result.get("handoff_reason"),
-                    }
-                )
+                dialog_history.metadata["last_user_intent"] = agent_result.get("user_intent")
+                dialog_history.metadata["last_handoff_reason"] = agent_result.get("handoff_reason")
 
             # Сохраняем диалог
             await self._save_dialog(dialog_history)
 
             # Добавляем в активные диалоги
-            self.active_dialogs[dialog_id] = now
-
-            logger.info(
-                f"Создан новый диалог {dialog_id} для клиента {dialog_create.customer_info.name}"
-                + (
-                    f", обработано начальное сообщение, назначен агент: {dialog_history.current_agent}"
-                    if dialog_create.initial_message
-                    else ""
+            self.activity.touch(dialog_id)
+            self._lc_cache[dialog_id] = self._convert_to_langchain_messages(dialog_history.messages)
+            self._cache_history(dialog_history)
+
+            if dialog_create.initial_message:
+                logger.info(
+                    "Создан новый диалог %s для клиента %s, обработано начальное сообщение, "
+                    "назначен агент: %s",
+                    dialog_id,
+                    dialog_create.customer_info.name,
+                    dialog_history.current_agent,
+                )
+            else:
+                logger.info(
+                    "Создан новый диалог %s для клиента %s",
+                    dialog_id,
+                    dialog_create.customer_info.name,
                 )
-            )
             return dialog_history
 
         except Exception as e:
-            logger.error(f"Ошибка создания диалога: {e}")
+            logger.error("Ошибка создания диалога: %s", e)
             raise DialogException(f"Не удалось создать диалог: {e}") from e
 
     async def send_message(self, dialog_id: str, message_request: MessageRequest) -> DialogResponse:
@@ -169,6 +268,7 @@ class DialogManager:
 
         Raises:
         ------
+            NotFoundDialogException: Если диалог не найден
             DialogException: При ошибке обработки сообщения
 
         """
@@ -182,89 +282,107 @@ class DialogManager:
                     f"Диалог {dialog_id} не активен (статус: {dialog_history.status})"
                 )
 
+            # Одна отметка времени на весь ход диалога
+            now = datetime.now(tz=timezone.utc)
+
             # Создаем сообщение пользователя
             user_message = DialogMessage(
-                id=str(uuid.uuid4()),
+                id=_new_id(),
                 dialog_id=dialog_id,
                 sender=message_request.message_type,
                 message=message_request.message,
                 agent_name=None,
-                timestamp=datetime.now(),
+                timestamp=now,
                 metadata=message_request.metadata,
             )
 
-            # Добавляем сообщение в историю
-            dialog_history.messages.append(user_message)
-
-            # Конвертируем историю в формат LangChain
-            message_history = self._convert_to_langchain_messages(dialog_history.messages[:-1])
+            # История в формате LangChain до текущего сообщения берется из кэша
+            lc_history = self._get_langchain_history(dialog_history)
 
             # Обрабатываем через оркестратор агентов
             agent_result = await self.orchestrator.process_dialog_turn(
                 dialog_id=dialog_id,
                 user_message=message_request.message,
-                message_history=message_history,
+                message_history=list(lc_history),
             )
 
             # Создаем ответное сообщение агента
             agent_message = DialogMessage(
-                id=str(uuid.uuid4()),
+                id=_new_id(),
                 dialog_id=dialog_id,
                 sender="agent",
                 message=agent_result["agent_response"],
                 agent_name=agent_result["current_agent"],
-                timestamp=datetime.now(),
+                timestamp=now,
                 metadata=agent_result["metadata"],
             )
 
-            # Добавляем ответ агента в историю
+            # Добавляем сообщения в историю только после успешного ответа,
+            # чтобы ошибка не оставила в кэшированной истории лишнее сообщение
+            dialog_history.messages.append(user_message)
             dialog_history.messages.append(agent_message)
+            lc_history.extend(self._convert_to_langchain_messages([user_message, agent_message]))
 
             # Обновляем метаданные диалога
-            dialog_history.current_agent = agent_result["current_agent"]
-            dialog_history.updated_at = datetime.now()
-            dialog_history.metadata.update(
-                {
-                    "last_user_intent": agent_result.get("user_intent"),
-                    "last_handoff_reason": agent_result.get("handoff_reason"),
-                }
-            )
+            current_agent = agent_result["current_agent"]
+            user_intent = agent_result.get("user_intent")
+            handoff_reason = agent_result.get("handoff_reason")
+            dialog_history.current_agent = current_agent
+            dialog_history.updated_at = now
+            dialog_history.metadata["last_user_intent"] = user_intent
+            dialog_history.metadata["last_handoff_reason"] = handoff_reason
 
             # Ограничиваем историю сообщений
-            if len(dialog_history.messages) > settings.max_dialog_history_length:
-                # Сохраняем краткое содержание старых сообщений
-                old_messages = dialog_history.messages[: -settings.max_dialog_history_length]
-                dialog_history.conversation_summary = await self._summarize_messages(old_messages)
-                dialog_history.messages = dialog_history.messages[
-                    -settings.max_dialog_history_length :
-                ]
-
-            # Сохраняем обновленную историю
-            await self._save_dialog(dialog_history)
+            max_length = settings.max_dialog_history_length
+            if len(dialog_history.messages) > max_length:
+                # Вытесняем старые сообщения пакетом с запасом, чтобы
+                # суммаризация выполнялась раз в несколько ходов
+                keep = max_length - min(_SUMMARY_BATCH_SIZE, max_length // 2)
+                old_messages = dialog_history.messages[:-keep]
+                batch_summary = await self._summarize_messages(old_messages)
+
+                # Дополняем накопленное краткое содержание новым пакетом
+                summary = dialog_history.conversation_summary
+                summary = f"{summary}\n{batch_summary}" if summary else batch_summary
+
+                # Ограничиваем длину, отбрасывая самые старые пакеты
+                if len(summary) > settings.max_summary_length:
+                    summary = summary[-settings.max_summary_length :]
+                    newline = summary.find("\n")
+                    if newline != -1:
+                        summary = summary[newline + 1 :]
+                dialog_history.conversation_summary = summary
+                dialog_history.messages = dialog_history.messages[-keep:]
+                # Синхронно обрезаем кэш LangChain-сообщений
+                del lc_history[: sum(m.sender in ("user", "agent") for m in old_messages)]
+
+            # Ставим обновленную историю в очередь пакетной записи
+            self.write_coalescer.mark_dirty(dialog_history)
+            self._cache_history(dialog_history)
 
             # Обновляем время активности
-            self.active_dialogs[dialog_id] = datetime.now()
+            self.activity.touch(dialog_id)
 
             # Создаем ответ
             response = DialogResponse(
                 dialog_id=dialog_id,
                 message_id=user_message.id,
                 agent_response=agent_result["agent_response"],
-                current_agent=agent_result["current_agent"],
+                current_agent=current_agent,
                 previous_agent=agent_result.get("previous_agent"),
-                handoff_reason=agent_result.get("handoff_reason"),
-                user_intent=agent_result.get("user_intent"),
-                timestamp=agent_message.timestamp,
+                handoff_reason=handoff_reason,
+                user_intent=user_intent,
+                timestamp=now,
                 metadata=agent_result["metadata"],
             )
 
-            logger.info(
-                f"Обработано сообщение в диалоге {dialog_id}, агент: {response.current_agent}"
-            )
+            logger.info("Обработано сообщение в диалоге %s, агент: %s", dialog_id, current_agent)
             return response
 
+        except NotFoundDialogException:
+            raise
         except Exception as e:
-            logger.error(f"Ошибка обработки сообщения в диалоге {dialog_id}: {e}")
+            logger.error("Ошибка обработки сообщения в диалоге %s: %s", dialog_id, e)
             raise DialogException(f"Не удалось обработать сообщение: {e}") from e
 
     async def get_dialog_history(self, dialog_id: str) -> DialogHistory:
@@ -281,26 +399,83 @@ class DialogManager:
 
         Raises:
         ------
-            DialogException: Если диалог не найден
+            NotFoundDialogException: Если диалог не найден
 
         """
         try:
-            dialog_file = settings.get_dialog_file_path(dialog_id)
+            cached = self._history_cache.get(dialog_id)
+            if cached is not None:
+                self._history_cache.move_to_end(dialog_id)
+                return cached
 
-            if not dialog_file.exists():
-                raise DialogException(f"Диалог {dialog_id} не найден")
+            # Диалог мог еще не попасть на диск из очереди записи
+            pending = self.write_coalescer.get_pending(dialog_id)
+            if pending is not None:
+                return pending
 
-            with dialog_file.open("r", encoding="utf-8") as f:
-                dialog_data = json.load(f)
+            dialog_file = settings.get_dialog_file_path(dialog_id)
 
-            return DialogHistory(**dialog_data)
+            try:
+                raw = await asyncio.to_thread(_read_file_sync, dialog_file)
+            except FileNotFoundError:
+                raise NotFoundDialogException(f"Диалог {dialog_id} не найден") from None
+
+            # Разбор JSON и валидация выполняются за один проход в pydantic-core
+            dialog_history = DialogHistory.model_validate_json(raw)
+            if dialog_history.status in ("active", "pending"):
+                self._cache_history(dialog_history)
+            return dialog_history
 
         except DialogException:
             raise
         except Exception as e:
-            logger.error(f"Ошибка загрузки диалога {dialog_id}: {e}")
+            logger.error("Ошибка загрузки диалога %s: %s", dialog_id, e)
             raise DialogException(f"Не удалось загрузить диалог: {e}") from e
 
+    async def get_dialog_summary(self, dialog_id: str) -> DialogStatusResponse:
+        """
+        Получение краткого статуса диалога без загрузки сообщений.
+
+        Читает небольшой файл метаданных, который сохраняется вместе
+        с диалогом. Для диалогов, сохраненных без него, загружает
+        полную историю.
+
+        Args:
+        ----
+            dialog_id: Идентификатор диалога
+
+        Returns:
+        -------
+            Краткий статус диалога
+
+        Raises:
+        ------
+            NotFoundDialogException: Если диалог не найден
+
+        """
+        try:
+            loaded = self._history_cache.get(dialog_id) or self.write_coalescer.get_pending(
+                dialog_id
+            )
+            if loaded is not None:
+                return self._build_summary(loaded)
+
+            meta_file = settings.get_dialog_meta_file_path(dialog_id)
+
+            try:
+                raw = await asyncio.to_thread(_read_file_sync, meta_file)
+            except FileNotFoundError:
+                dialog_history = await self.get_dialog_history(dialog_id)
+                return self._build_summary(dialog_history)
+
+            return DialogStatusResponse.model_validate_json(raw)
+
+        except DialogException:
+            raise
+        except Exception as e:
+            logger.error("Ошибка загрузки статуса диалога %s: %s", dialog_id, e)
+            raise DialogException(f"Не удалось загрузить статус диалога: {e}") from e
+
     async def close_dialog(self, dialog_id: str, reason: str = "completed") -> DialogHistory:
         """
         Закрытие диалога.
@@ -316,6 +491,7 @@ class DialogManager:
 
         Raises:
         ------
+            NotFoundDialogException: Если диалог не найден
             DialogException: При ошибке закрытия диалога
 
         """
@@ -323,19 +499,24 @@ class DialogManager:
             dialog_history = await self.get_dialog_history(dialog_id)
 
             dialog_history.status = "closed"
-            dialog_history.updated_at = datetime.utcnow()
+            dialog_history.updated_at = datetime.now(tz=timezone.utc)
             dialog_history.metadata["close_reason"] = reason
 
-            await self._save_dialog(dialog_history)
+            # Запись идет через очередь, чтобы не пересечься с фоновой записью диалога
+            await self.write_coalescer.save_now(dialog_history)
 
             # Удаляем из активных диалогов
-            self.active_dialogs.pop(dialog_id, None)
+            self.activity.discard(dialog_id)
+            self._lc_cache.pop(dialog_id, None)
+            self._history_cache.pop(dialog_id, None)
 
-            logger.info(f"Диалог {dialog_id} закрыт. Причина: {reason}")
+            logger.info("Диалог %s закрыт. Причина: %s", dialog_id, reason)
             return dialog_history
 
+        except NotFoundDialogException:
+            raise
         except Exception as e:
-            logger.error(f"Ошибка закрытия диалога {dialog_id}: {e}")
+            logger.error("Ошибка закрытия диалога %s: %s", dialog_id, e)
             raise DialogException(f"Не удалось закрыть диалог: {e}") from e
 
     async def cleanup_inactive_dialogs(self) -> int:
@@ -347,24 +528,23 @@ class DialogManager:
             Количество закрытых диалогов
 
         """
-        timeout_delta = timedelta(minutes=settings.dialog_timeout_minutes)
-        current_time = datetime.utcnow()
         closed_count = 0
 
-        inactive_dialogs = []
-        for dialog_id, last_activity in self.active_dialogs.items():
-            if current_time - last_activity > timeout_delta:
-                inactive_dialogs.append(dialog_id)
+        inactive_dialogs = self.activity.pop_expired(settings.dialog_timeout_minutes * 60)
 
         for dialog_id in inactive_dialogs:
             try:
                 await self.close_dialog(dialog_id, "timeout")
                 closed_count += 1
+            except NotFoundDialogException:
+                logger.warning("Неактивный диалог %s не найден", dialog_id)
             except Exception as e:
-                logger.error(f"Ошибка закрытия неактивного диалога {dialog_id}: {e}")
+                logger.error("Ошибка закрытия неактивного диалога %s: %s", dialog_id, e)
+                # Повторяем закрытие при следующей очистке
+                self.activity.expire(dialog_id)
 
         if closed_count > 0:
-            logger.info(f"Закрыто {closed_count} неактивных диалогов")
+            logger.info("Закрыто %s неактивных диалогов", closed_count)
 
         return closed_count
 
@@ -383,6 +563,8 @@ class DialogManager:
 
         Raises:
         ------
+            NotFoundDialogException: Если диалог не найден
+            ValidationException: При удалении активного диалога без force
             DialogException: При ошибке удаления диалога
 
         """
@@ -392,24 +574,33 @@ class DialogManager:
 
             # Проверяем статус диалога
             if dialog_history.status == "active" and not force:
-                raise DialogException(
+                raise ValidationException(
                     f"Нельзя удалить активный диалог {dialog_id}. Сначала закройте его или используйте force=True"
                 )
 
-            # Удаляем файл
+            # Отменяем ожидающую запись и дожидаемся текущей, затем удаляем файлы
+            await self.write_coalescer.discard(dialog_id)
             dialog_file = settings.get_dialog_file_path(dialog_id)
-            if dialog_file.exists():
-                dialog_file.unlink()
-                logger.info(f"Файл диалога {dialog_id} удален")
+            if os.path.exists(dialog_file):
+                os.remove(dialog_file)
+                logger.info("Файл диалога %s удален", dialog_id)
+
+            meta_file = settings.get_dialog_meta_file_path(dialog_id)
+            if os.path.exists(meta_file):
+                os.remove(meta_file)
 
             # Удаляем из активных диалогов
-            self.active_dialogs.pop(dialog_id, None)
+            self.activity.discard(dialog_id)
+            self._lc_cache.pop(dialog_id, None)
+            self._history_cache.pop(dialog_id, None)
 
-            logger.info(f"Диалог {dialog_id} полностью удален")
+            logger.info("Диалог %s полностью удален", dialog_id)
             return True
 
+        except (NotFoundDialogException, ValidationException):
+            raise
         except Exception as e:
-            logger.error(f"Ошибка удаления диалога {dialog_id}: {e}")
+            logger.error("Ошибка удаления диалога %s: %s", dialog_id, e)
             raise DialogException(f"Не удалось удалить диалог: {e}") from e
 
     async def cleanup_closed_dialogs(self, older_than_days: int = 7) -> int:
@@ -426,36 +617,61 @@ class DialogManager:
 
         """
         deleted_count = 0
-        cutoff_date = datetime.utcnow() - timedelta(days=older_than_days)
+        cutoff_date = datetime.now(tz=timezone.utc) - timedelta(days=older_than_days)
 
         try:
-            # Ищем все файлы диалогов
-            for dialog_file in self.storage_path.glob("*.json"):
+            # Разбираем только файлы, не изменявшиеся с момента отсечки
+            dialog_files = await asyncio.to_thread(
+                _list_stale_dialog_files, str(self.storage_path), cutoff_date.timestamp()
+            )
+
+            # Читаем файлы параллельно в пуле потоков
+            results = await asyncio.gather(
+                *[asyncio.to_thread(_load_dialog_sync, f) for f in dialog_files],
+                return_exceptions=True,
+            )
+
+            for dialog_file, dialog_data in zip(dialog_files, results):
                 try:
-                    with dialog_file.open("r", encoding="utf-8") as f:
-                        dialog_data = json.load(f)
-
-                    # Проверяем статус и дату
-                    if (
-                        dialog_data.get("status") == "closed"
-                        and datetime.fromisoformat(dialog_data.get("updated_at", "")) < cutoff_date
-                    ):
+                    if isinstance(dialog_data, BaseException):
+                        raise dialog_data
+
+                    if dialog_data.get("status") != "closed":
+                        continue
+
+                    # Диалоги, сохраненные ранее, хранят время без часового пояса
+                    updated_at = datetime.fromisoformat(dialog_data.get("updated_at", ""))
+                    if updated_at.tzinfo is None:
+                        updated_at = updated_at.replace(tzinfo=timezone.utc)
+
+                    if updated_at < cutoff_date:
                         dialog_id = dialog_data.get("dialog_id")
+                        if not isinstance(dialog_id, str):
+                            raise ValueError("в файле отсутствует идентификатор диалога")
                         await self.delete_dialog(dialog_id, force=True)
                         deleted_count += 1
 
                 except Exception as e:
-                    logger.error(f"Ошибка обработки файла {dialog_file}: {e}")
+                    logger.error("Ошибка обработки файла %s: %s", dialog_file, e)
 
             if deleted_count > 0:
-                logger.info(f"Удалено {deleted_count} старых закрытых диалогов")
+                logger.info("Удалено %s старых закрытых диалогов", deleted_count)
 
             return deleted_count
 
         except Exception as e:
-            logger.error(f"Ошибка очистки закрытых диалогов: {e}")
+            logger.error("Ошибка очистки закрытых диалогов: %s", e)
             return 0
 
+    async def flush_pending(self) -> None:
+        """
+        Сохранение всех диалогов, ожидающих записи.
+
+        Вызывается при завершении работы приложения, чтобы изменения
+        из очереди пакетной записи не были потеряны.
+        """
+        await self.write_coalescer.close()
+
     async def _save_dialog(self, dialog_history: DialogHistory) -> None:
         """
         Сохранение истории диалога в файл.
@@ -471,29 +687,86 @@ class DialogManager:
         """
         try:
             dialog_file = settings.get_dialog_file_path(dialog_history.dialog_id)
-            dialog_data = dialog_history.model_dump(mode="json")
-
-            # Конвертируем datetime объекты в строки
-            from typing import Any
-
-            def convert_datetime(obj: Any) -> Any:
-                if isinstance(obj, datetime):
-                    return obj.isoformat()
-                elif isinstance(obj, dict):
-                    return {k: convert_datetime(v) for k, v in obj.items()}
-                elif isinstance(obj, list):
-                    return [convert_datetime(item) for item in obj]
-                return obj
+            # Сериализация средствами pydantic-core: в отличие от orjson
+            # она не ограничивает целые числа в метаданных 64 битами
+            dialog_bytes = dialog_history.model_dump_json(indent=2).encode()
 
-            dialog_data = convert_datetime(dialog_data)
+            # Метаданные сохраняются отдельно для быстрого получения статуса
+            meta_file = settings.get_dialog_meta_file_path(dialog_history.dialog_id)
+            meta_bytes = self._build_summary(dialog_history).model_dump_json().encode()
 
-            with dialog_file.open("w", encoding="utf-8") as f:
-                json.dump(dialog_data, f, ensure_ascii=False, indent=2)
+            # Запись на диск выполняется вне event loop
+            await asyncio.to_thread(_save_dialog_sync, dialog_file, dialog_bytes)
+            await asyncio.to_thread(_save_dialog_sync, meta_file, meta_bytes)
 
         except Exception as e:
-            logger.error(f"Ошибка сохранения диалога {dialog_history.dialog_id}: {e}")
+            logger.error("Ошибка сохранения диалога %s: %s", dialog_history.dialog_id, e)
             raise StorageException(f"Не удалось сохранить диалог: {e}") from e
 
+    def _build_summary(self, dialog_history: DialogHistory) -> DialogStatusResponse:
+        """
+        Формирование краткого статуса по истории диалога.
+
+        Args:
+        ----
+            dialog_history: История диалога
+
+        Returns:
+        -------
+            Краткий статус диалога
+
+        """
+        return DialogStatusResponse(
+            dialog_id=dialog_history.dialog_id,
+            status=dialog_history.status,
+            current_agent=dialog_history.current_agent,
+            message_count=len(dialog_history.messages),
+            created_at=dialog_history.created_at,
+            updated_at=dialog_history.updated_at,
+            customer_name=dialog_history.customer_info.name,
+        )
+
+    def _cache_history(self, dialog_history: DialogHistory) -> None:
+        """
+        Помещение истории диалога в LRU-кэш.
+
+        При превышении размера кэша вытесняется давно не использованный диалог
+        вместе с его историей в формате LangChain.
+
+        Args:
+        ----
+            dialog_history: История диалога
+
+        """
+        self._history_cache[dialog_history.dialog_id] = dialog_history
+        self._history_cache.move_to_end(dialog_history.dialog_id)
+        while len(self._history_cache) > settings.dialog_cache_size:
+            evicted_id, _ = self._history_cache.popitem(last=False)
+            # Кэш LangChain-сообщений восстанавливается при следующем обращении
+            self._lc_cache.pop(evicted_id, None)
+
+    def _get_langchain_history(self, dialog_history: DialogHistory) -> List[BaseMessage]:
+        """
+        Получение истории диалога в формате LangChain из кэша.
+
+        При отсутствии в кэше история конвертируется один раз целиком,
+        дальше кэш дополняется новыми сообщениями по мере их появления.
+
+        Args:
+        ----
+            dialog_history: История диалога
+
+        Returns:
+        -------
+            Кэшированный список сообщений в формате LangChain
+
+        """
+        lc_history = self._lc_cache.get(dialog_history.dialog_id)
+        if lc_history is None:
+            lc_history = self._convert_to_langchain_messages(dialog_history.messages)
+            self._lc_cache[dialog_history.dialog_id] = lc_history
+        return lc_history
+
     def _convert_to_langchain_messages(self, messages: List[DialogMessage]) -> List[BaseMessage]:
         """
         Конвертация сообщений в формат LangChain.